@@ -21,7 +21,7 @@ class BadSampleException(RuntimeError):
         super().__init__(*args)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionContext:
     sample: SampleID
     processor: 'SampleProcessor'
@@ -1,8 +1,6 @@
-import sys
 import warnings
 from abc import ABCMeta, abstractmethod
-from collections import deque
-from typing import Any, Optional, Iterable, Deque, TYPE_CHECKING, Type, Callable
+from typing import Any, Optional, Iterable, TYPE_CHECKING, Type, Callable
 
 from .cache import BaseCache, SingleValueCache, SampleCache
 from .dataset import DatasetLoader, Sample, DictSample
@@ -18,6 +16,7 @@ if TYPE_CHECKING:
 
 
 class BaseGraphNode(metaclass=ABCMeta):
+    __slots__ = ("children", "parents", "_depth")
     extraction_policy = ExtractionPolicy()
 
     def __init__(self):
@@ -69,6 +68,7 @@ class BaseGraphNode(metaclass=ABCMeta):
 class SampleProcessorNode(BaseGraphNode):
     """Wraps a processor. If it has several child node, it's able to cache
     the result of its processor for each sample."""
+    __slots__ = ("cache", "processor")
 
     default_cache_type: Type[BaseCache] = SampleCache
 
@@ -79,7 +79,12 @@ class SampleProcessorNode(BaseGraphNode):
 
     def compute_sample(self, sample: Sample) -> Any:
         try:
-            parents_output = tuple(node[sample] for node in self.parents)
+            # most nodes are links of a linear chain of processors: in that case,
+            # no need to go through a generator to pull the parent's output
+            if len(self.parents) == 1:
+                parents_output = (self.parents[0][sample],)
+            else:
+                parents_output = tuple(node[sample] for node in self.parents)
         except BadSampleException as err:
             self.cache.add_failed_sample(sample)
             raise err
@@ -94,14 +99,12 @@ class SampleProcessorNode(BaseGraphNode):
             return self.processor(sample, parents_output)
         except Exception as err:
             if self.extraction_policy.skip_errors:
-                logger.warning(
-                    f"Got error in processor {self.processor} on sample {sample.id} : "
-                    f"\"{str(type(err))} : {str(err)}\"")
+                logger.warning("Got error in processor %s on sample %s : \"%s : %s\"",
+                               self.processor, sample.id, type(err), err)
                 self.cache.add_failed_sample(sample)
                 raise BadSampleException(sample)
             else:
-                tb = sys.exc_info()[2]
-                raise ExtractionError(err, ExtractionContext(sample.id, self.processor)).with_traceback(tb)
+                raise ExtractionError(err, ExtractionContext(sample.id, self.processor)).with_traceback(err.__traceback__)
 
     def __getitem__(self, sample: Sample) -> Sample:
         # if node has no children or one child, or if cache is disabled,
@@ -124,6 +127,7 @@ class SampleProcessorNode(BaseGraphNode):
 
 
 class AggregatorNode(BaseGraphNode):
+    __slots__ = ("cache", "processor")
     processor: DatasetAggregator
 
     def __init__(self, processor: DatasetAggregator):
@@ -162,6 +166,7 @@ class AggregatorNode(BaseGraphNode):
 
 
 class BaseFeatureNode(SampleProcessorNode):
+    __slots__ = ()
     processor: BaseFeat
 
     def __hash__(self):
@@ -194,12 +199,14 @@ class BaseFeatureNode(SampleProcessorNode):
 class FeatureNode(BaseFeatureNode):
     """Doesn't do any processing, just here as a passthrough node from
     which to pull samples for a specific feature"""
+    __slots__ = ()
     processor: SampleFeatureProcessor
 
 
 class DatasetFeatureNode(BaseFeatureNode):
     """Doesn't do any processing, just here as a passthrough node from
     which pull a dataset feature"""
+    __slots__ = ()
     default_cache_type = SingleValueCache
     processor: DatasetFeatureProcessor
 
@@ -209,6 +216,8 @@ class DatasetFeatureNode(BaseFeatureNode):
 
 
 class BaseInputNode(SampleProcessorNode):
+    __slots__ = ("is_feat",)
+
     def __init__(self, processor: SampleProcessor, is_feat: bool = False):
         super().__init__(processor)
         self.is_feat = is_feat
@@ -224,17 +233,20 @@ class BaseInputNode(SampleProcessorNode):
 
 
 class InputNode(BaseInputNode):
+    __slots__ = ()
     # TODO: doc
     processor: SampleInputProcessor
 
 
 class DatasetInputNode(BaseInputNode):
+    __slots__ = ()
     # TODO: doc
     processor: DatasetInputProcessor
     default_cache_type = SingleValueCache
 
 
 class RootNode(BaseGraphNode):
+    __slots__ = ("_loader",)
 
     def __init__(self):
         super().__init__()
@@ -278,6 +290,9 @@ class ExtractionDAG:
         # stores all the processing (input, feature and processor) nodes from
         # the dag
         self.nodes: set[BaseGraphNode] = set()
+        # maps each node of the DAG to itself, so a node that's equal to
+        # another one (same processor and ancestry) can be retrieved in O(1)
+        self._nodes_index: dict[BaseGraphNode, BaseGraphNode] = dict()
         # stores only the feature nodes
         self.feature_nodes: dict[str, FeatureNode] = dict()
         # stores only the feature nodes
@@ -287,6 +302,9 @@ class ExtractionDAG:
         self._loader: Optional[DatasetLoader] = None
         self._needs_dependency_solving = False
         self._features_order: Optional[list[FeatureName]] = None
+        # whether some processors still have unset hyperparameters, computed
+        # lazily and reset whenever nodes are added to or removed from the DAG
+        self._has_unset_hparams: Optional[bool] = None
 
     @property
     def features(self) -> set[str]:
@@ -314,6 +332,19 @@ class ExtractionDAG:
     def all_inputs(self):
         return self.inputs | self.dataset_inputs
 
+    @property
+    def has_unset_hparams(self) -> bool:
+        if self._has_unset_hparams is None:
+            self._has_unset_hparams = any(node.processor.unset_hparams for node in self.nodes
+                                          if isinstance(node, (SampleProcessorNode, AggregatorNode)))
+        return self._has_unset_hparams
+
+    def set_hparams(self, params: dict[str, Any]):
+        for node in self.nodes:
+            if isinstance(node, (SampleProcessorNode, AggregatorNode)):
+                node.processor.set_hparams(**params)
+        self._has_unset_hparams = None
+
     def reset(self):
         self.set_loader(None)
         for node in self.nodes:
@@ -323,19 +354,38 @@ class ExtractionDAG:
     def genealogical_search(self, searched_node: BaseGraphNode) -> Optional[BaseGraphNode]:
         """Search the DAG for a node that is the same node and has the same
         ancestry as the searched node. If nothing is found, returns None"""
-        if searched_node not in self.nodes:
-            return None
-
-        for dag_node in self.nodes:
-            if dag_node == searched_node:
-                return dag_node
+        return self._nodes_index.get(searched_node)
+
+    def merge_duplicate(self, duplicate_node: BaseGraphNode, dag_node: BaseGraphNode):
+        """Links all the children of a node to an equivalent node from the DAG,
+        and detaches it (and its ancestors that aren't used anymore) from its
+        parents, e.g., when two branches of a diamond do the same computation.
+        Duplicates are merged whether they're found when popped from the walk's
+        stack or when found as the parent of a node being added.
+        Nodes are compared by identity, as both nodes are equal."""
+        for child in duplicate_node.children:
+            for parent_idx, parent in enumerate(child.parents):
+                if parent is duplicate_node:
+                    child.parents[parent_idx] = dag_node
+                    dag_node.children.append(child)
+
+        stack: list[BaseGraphNode] = [duplicate_node]
+        while stack:
+            node = stack.pop()
+            for parent in node.parents:
+                parent.children = [child for child in parent.children if child is not node]
+                if not parent.children and self.genealogical_search(parent) is not parent:
+                    stack.append(parent)
 
     def add_pipeline(self, pipeline: 'ExtractionPipeline'):
         # first, checking that the pipeline is right
         pipeline.check()
 
         feature_nodes: list[BaseFeatureNode] = pipeline.outputs
-        nodes_stack: Deque[BaseGraphNode] = deque(feature_nodes)
+        nodes_stack: list[BaseGraphNode] = list(feature_nodes)
+        # ids of the pipeline nodes that have already been popped from the stack,
+        # so nodes shared by several branches are only walked once
+        visited: set[int] = set()
         # registering feature nodes (and checking that they're not already present)
         for feat_node in feature_nodes:
             # checking that there isn't already a feature named like the ones
@@ -351,13 +401,25 @@ class ExtractionDAG:
         # algorithm outline:
         # stack = list(feature leafs)
         # for node in stack:
-        # - pop it from the stack
+        # - pop it from the stack (skipping it if it has already been visited)
         # - check if parent nodes' hash is found somewhere in the tree
         # - if parent node hash is found, connect current node to DAG node
         # - else, add parent nodes to stack
+        # The walk is a depth-first one (LIFO list stack): the order in which
+        # nodes are visited doesn't matter, as a node that turns out to be equal
+        # to a node added in the meantime is merged into it (c.f. merge_duplicate)
         while nodes_stack:
             node = nodes_stack.pop()
-            if node in self.nodes:
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            dag_node = self.genealogical_search(node)
+            if dag_node is not None:
+                # an equivalent node (e.g., the same input used in two branches
+                # of this pipeline) has been added to the DAG in the meantime:
+                # the current node's children are linked to it instead
+                if dag_node is not node:
+                    self.merge_duplicate(node, dag_node)
                 continue
             # This condition is for feature nodes that are used as inputs.
             # These will be 'dependency-solved' later on, for now
@@ -371,6 +433,7 @@ class ExtractionDAG:
                     node = DatasetInputNode(DSInput(node.feature_name), is_feat=True)
 
             self.nodes.add(node)
+            self._nodes_index[node] = node
             # an input node has to be directly connected to the root node
             # NOTE: if an input node is put on the stack, it means that this
             # particular input node wasn't already present as a rootnode's children
@@ -382,15 +445,21 @@ class ExtractionDAG:
 
             for node_parent in list(node.parents):
                 dag_node = self.genealogical_search(node_parent)
-                if dag_node is not None:
-                    # replace current parent with dag parent
-                    node.replace_parent(node_parent, dag_node)
-                    # add the current node as a child to the dag parent
-                    dag_node.children.append(node)
+                if dag_node is node_parent:
+                    # parent is a node from this pipeline that has already been
+                    # added to the DAG: it's already linked to the current node
+                    continue
+                elif dag_node is not None:
+                    # the parent is a duplicate of a dag node: its children (the current
+                    # node included) are linked to the dag node, and it's detached from
+                    # its own parents so it doesn't linger as their child
+                    self.merge_duplicate(node_parent, dag_node)
+                    visited.add(id(node_parent))
                 else:
-                    nodes_stack.appendleft(node_parent)
+                    nodes_stack.append(node_parent)
 
         self._needs_dependency_solving = True
+        self._has_unset_hparams = None
 
     def solve_dependencies(self):
         """Connects inputs that are actually features to the corresponding
@@ -420,8 +489,10 @@ class ExtractionDAG:
             # removing the input node from the root node's children
             root_children.remove(node)
             self.nodes.remove(node)
+            self._nodes_index.pop(node, None)
 
         self._needs_dependency_solving = False
+        self._has_unset_hparams = None
 
     def prune_features(self,
                        keep_only: Optional[Iterable[str]] = None,
@@ -456,6 +527,7 @@ class ExtractionDAG:
                 continue
 
             self.nodes.remove(node)
+            self._nodes_index.pop(node, None)
             for parent in node.parents:
                 parent.children.remove(node)
                 if not parent.children:
@@ -464,6 +536,7 @@ class ExtractionDAG:
         # once everything has been cleaned, removing the features from the registry:
         for feat in removed_features:
             del self.feature_nodes[feat]
+        self._has_unset_hparams = None
 
     def compute_feature_order(self):
         # sorting feature node by increasing depth
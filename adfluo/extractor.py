@@ -40,11 +40,14 @@ class Extractor:
         return set(chain.from_iterable(node.processor.hparams for node in self.extraction_DAG.nodes
                                        if isinstance(node, (SampleProcessorNode, AggregatorNode))))
 
+    @property
+    def unset_hparams(self) -> set[str]:
+        return set(chain.from_iterable(node.processor.unset_hparams for node in self.extraction_DAG.nodes
+                                       if isinstance(node, (SampleProcessorNode, AggregatorNode))))
+
     def set_hparams(self, params: dict[str, Any]):
         assert set(params.keys()) == self.hparams
-        for node in self.extraction_DAG.nodes:
-            if isinstance(node, (SampleProcessorNode, AggregatorNode)):
-                node.processor.set_hparams(**params)
+        self.extraction_DAG.set_hparams(params)
 
     def set_extraction_policy(self, no_cache: bool, skip_errors: bool):
         BaseGraphNode.extraction_policy = ExtractionPolicy(skip_errors=skip_errors, no_cache=no_cache)
@@ -63,7 +66,7 @@ class Extractor:
         if not isinstance(pipeline, ExtractionPipeline):
             raise ValueError(f"The pipeline has to be an {ExtractionPipeline} "
                              f"instance")
-        pipeline.check()
+        # the pipeline is checked by the DAG before being added to it
         self.extraction_DAG.add_pipeline(pipeline)
 
         if drop_on_save:
@@ -74,8 +77,9 @@ class Extractor:
     def extract_aggregations(self, dataset: Dataset):
         """Temporary (?) method to extract aggregations for dataset features that have a
         storage protocol"""
-        if self.hparams:
-            raise RuntimeError(f"Hyperparameters {', '.join(self.hparams)} should have been set before extraction.")
+        if self.extraction_DAG.has_unset_hparams:
+            raise RuntimeError(f"Hyperparameters {', '.join(self.unset_hparams)} "
+                               f"should have been set before extraction.")
 
         if isinstance(dataset, list):
             dataset = ListLoader(dataset)
@@ -96,10 +100,8 @@ class Extractor:
                  extraction_order: ExtractionOrder,
                  storage: BaseStorage,
                  flatten_features: bool):
-        unset_hparams = set(chain.from_iterable(node.processor.unset_hparams for node in self.extraction_DAG.nodes
-                                                if isinstance(node, (SampleProcessorNode, AggregatorNode))))
-        if unset_hparams:
-            raise RuntimeError(f"Hyperparameters {', '.join(self.hparams)} still need to be set.")
+        if self.extraction_DAG.has_unset_hparams:
+            raise RuntimeError(f"Hyperparameters {', '.join(self.unset_hparams)} still need to be set.")
 
         assert extraction_order in ("sample", "feature")
         if isinstance(dataset, list):
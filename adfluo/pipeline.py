@@ -1,4 +1,5 @@
 import warnings
+import weakref
 from typing import Any, Union
 
 from .cache import SingleValueCache
@@ -14,30 +15,58 @@ PipelineElement = Union['ExtractionPipeline', ProcessorBase]
 ProcessorNode = SampleProcessorNode | AggregatorNode
 
 
-def wrap_processor(proc: ProcessorBase) -> ProcessorNode:
-    if isinstance(proc, Feat):
-        return FeatureNode(proc)
-    if isinstance(proc, DSFeat):
-        return DatasetFeatureNode(proc)
-    elif isinstance(proc, Input):
-        return InputNode(proc)
-    elif isinstance(proc, DSInput):
-        return DatasetInputNode(proc)
-    elif isinstance(proc, DatasetAggregator):
-        return AggregatorNode(proc)
-    elif isinstance(proc, SampleProcessor):
-        return SampleProcessorNode(proc)
+# maps a processor class to the node class it is wrapped in. Built-in processor
+# classes are registered here, subclasses are added on their first encounter by
+# `wrap_processor`. Classes are weakly referenced, so that processor classes
+# created on the fly can still be garbage-collected
+_NODE_TYPES_CACHE: weakref.WeakKeyDictionary[type, type[ProcessorNode]] = weakref.WeakKeyDictionary({
+    Feat: FeatureNode,
+    DSFeat: DatasetFeatureNode,
+    Input: InputNode,
+    DSInput: DatasetInputNode,
+})
+
+
+def resolve_node_type(proc_type: type) -> type[ProcessorNode]:
+    if issubclass(proc_type, Feat):
+        return FeatureNode
+    if issubclass(proc_type, DSFeat):
+        return DatasetFeatureNode
+    elif issubclass(proc_type, Input):
+        return InputNode
+    elif issubclass(proc_type, DSInput):
+        return DatasetInputNode
+    elif issubclass(proc_type, DatasetAggregator):
+        return AggregatorNode
+    elif issubclass(proc_type, SampleProcessor):
+        return SampleProcessorNode
     else:
-        raise PipelineBuildError(PIPELINE_TYPE_ERROR.format(obj_type=type(proc)))
+        raise PipelineBuildError(PIPELINE_TYPE_ERROR.format(obj_type=proc_type))
+
+
+def wrap_processor(proc: ProcessorBase) -> ProcessorNode:
+    proc_type = type(proc)
+    node_type = _NODE_TYPES_CACHE.get(proc_type)
+    if node_type is None:
+        node_type = _NODE_TYPES_CACHE[proc_type] = resolve_node_type(proc_type)
+    return node_type(proc)
 
 
 # TODO : add "connect" function and streamline some of this code
 class ExtractionPipeline:
+    __slots__ = ("inputs", "outputs", "all_nodes", "_single_value_sources", "_checked")
 
     def __init__(self):
         self.inputs: list[ProcessorNode] = []
         self.outputs: list[ProcessorNode] = []
+        # every mutator only ever adds nodes downstream of the ones already
+        # present, so `all_nodes` is always in topological order (parents first)
         self.all_nodes: list[ProcessorNode] = []
+        # dataset input and aggregator nodes, kept aside to know if
+        # aggregations have to be checked without scanning all nodes
+        self._single_value_sources: list[ProcessorNode] = []
+        # set once the pipeline has been checked, reset by every mutator
+        self._checked = False
 
     @property
     def nb_inputs(self):
@@ -48,44 +77,32 @@ class ExtractionPipeline:
         return len(self.outputs)
 
     def check_aggregations(self):
-        stack: list[ProcessorNode] = [node for node in self.all_nodes
-                                      if isinstance(node, (DatasetInputNode, AggregatorNode))]
-        node_added_to_stack = True
-        single_value_nodes = []
-        while node_added_to_stack:
-            node_added_to_stack = False
-            node = stack.pop(0)
+        # `all_nodes` is in topological order: a single forward pass is enough,
+        # as a node's parents are always visited before that node
+        single_value_nodes: set[int] = set()
+        for node in self.all_nodes:
+            # dataset input nodes and aggregation nodes are the sources of single values
+            if isinstance(node, (DatasetInputNode, AggregatorNode)):
+                single_value_nodes.add(id(node))
+                continue
+
+            # a node only outputs a single value if all of its parents do
+            # (merger nodes with a sample-wise parent remain sample-wise)
+            if not node.parents or not all(id(parent_node) in single_value_nodes
+                                           for parent_node in node.parents):
+                continue
 
             assert not isinstance(node, FeatureNode), \
                 f"Cannot have a sample feature {str(node)} after an aggregation or dataset input"
+            single_value_nodes.add(id(node))
 
-            # skipping input nodes/agg nodes
-            if isinstance(node, (DatasetInputNode, AggregatorNode)):
-                single_value_nodes.append(node)
-                stack += node.children
-                node_added_to_stack = True
-                continue
-
-            # end of branch
+            # end of branch: dataset features already have a single value cache
             if isinstance(node, DatasetFeatureNode):
                 continue
 
-            # merger nodes situation
-            if len(node.parents) > 1:
-                parents_in_candidates = ((parent_node in single_value_nodes)
-                                         for parent_node in node.parents)
-                if not all(parents_in_candidates):
-                    stack.append(node)
-                    continue
-
             # remaining situation is : we have a node that's a 'single-value' candidate
             # and its cache has to be changed.
-            # children nodes can also be added to the stack
-            single_value_nodes.append(node)
-            # setting cache to single value
             node.cache = SingleValueCache(node)
-            stack += node.children
-            node_added_to_stack = True
 
     def check(self):
         """
@@ -95,23 +112,28 @@ class ExtractionPipeline:
          - "inner" nodes can't be input/feature nodes
          """
 
-        for node in self.inputs:
-            assert isinstance(node, (BaseInputNode, BaseFeatureNode)), \
-                "All inputs of a pipeline have to be either 'Input' or 'Feat' processors"
-        for node in self.outputs:
-            assert isinstance(node, BaseFeatureNode), \
-                "All outputs of a pipeline have to be Feat processors"
-        ends = set(self.inputs + self.outputs)
-        for node in self.all_nodes:
-            # TODO : better error
-            if node not in ends:
-                assert not isinstance(node, (BaseFeatureNode, BaseInputNode))
+        # these checks are only assertions: skipping the loops altogether
+        # when running with python -O
+        if __debug__:
+            for node in self.inputs:
+                assert isinstance(node, (BaseInputNode, BaseFeatureNode)), \
+                    "All inputs of a pipeline have to be either 'Input' or 'Feat' processors"
+            for node in self.outputs:
+                assert isinstance(node, BaseFeatureNode), \
+                    "All outputs of a pipeline have to be Feat processors"
+            # ends are compared by identity, as hashing a node hashes its whole ancestry
+            ends = {id(node) for node in self.inputs}
+            ends.update(id(node) for node in self.outputs)
+            for node in self.all_nodes:
+                # TODO : better error
+                if id(node) not in ends:
+                    assert not isinstance(node, (BaseFeatureNode, BaseInputNode))
 
         # then, checking aggregations if needed
-        for node in self.all_nodes:
-            if isinstance(node, (DatasetInputNode, AggregatorNode)):
-                self.check_aggregations()
-                break
+        if self._single_value_sources:
+            self.check_aggregations()
+
+        self._checked = True
 
     def append(self, proc: ProcessorBase):
         new_node = wrap_processor(proc)
@@ -128,25 +150,36 @@ class ExtractionPipeline:
         # adding a node as a merger of several branches
         else:
             assert proc.parameters.accept(self.nb_outputs)
-            new_node.parents = self.outputs
+            new_node.parents = list(self.outputs)
             for o in self.outputs:
                 o.children = [new_node]
         self.outputs = [new_node]
 
         self.all_nodes.append(new_node)
+        self._add_single_value_source(new_node)
+        self._checked = False
+
+    def _add_single_value_source(self, node: ProcessorNode):
+        if isinstance(node, (DatasetInputNode, AggregatorNode)):
+            self._single_value_sources.append(node)
 
     def concatenate(self, pipeline: 'ExtractionPipeline'):
         """Appends (in place) another pipeline to the current pipeline instance"""
 
+        # each node gets its own copy of the parents/children lists: these are
+        # edited in place once the nodes are added to an extraction DAG
+        nb_outputs = self.nb_outputs
         for left_in in pipeline.inputs:
             # TODO: better error
-            assert left_in.processor.parameters.accept(self.nb_outputs)
-            left_in.parents = self.outputs
+            assert left_in.processor.parameters.accept(nb_outputs)
+            left_in.parents = list(self.outputs)
         for right_out in self.outputs:
-            right_out.children = pipeline.inputs
+            right_out.children = list(pipeline.inputs)
 
         self.outputs = pipeline.outputs
         self.all_nodes += pipeline.all_nodes
+        self._single_value_sources += pipeline._single_value_sources
+        self._checked = False
 
     def add_parallel_proc(self, proc: ProcessorBase):
         """Adds a new processor that processes in parallel to the current pipeline instance"""
@@ -154,12 +187,16 @@ class ExtractionPipeline:
         self.inputs.append(new_node)
         self.outputs.append(new_node)
         self.all_nodes.append(new_node)
+        self._add_single_value_source(new_node)
+        self._checked = False
 
     def add_parallel_pipeline(self, pipeline: 'ExtractionPipeline'):
         """Adds a new pipeline that processes in parallel to the current pipeline instance"""
         self.inputs += pipeline.inputs
         self.outputs += pipeline.outputs
         self.all_nodes += pipeline.all_nodes
+        self._single_value_sources += pipeline._single_value_sources
+        self._checked = False
 
     def __rshift__(self, other: PipelineElement):
         if isinstance(other, ProcessorBase):
@@ -183,19 +220,31 @@ class ExtractionPipeline:
         # TODO: add support for datasets:
         #  - actually any input is a dataset (wrap sample with fake dataset)
         #  - add a rootnode and then remove it (needed for aggs)
-        self.check()
+        # the pipeline's structure only has to be checked once, not for every sample
+        if not self._checked:
+            self.check()
 
         if isinstance(sample, dict):
             sample = DictSample(sample, 0)
         output_dict: dict[FeatureName, Any] = {}
         # TODO: catch some errors (due to unsolved features/batch proc with no dataset)
         #  and "contextualize" them
-        for output_node in self.outputs:
-            # skipping nodes that aren't feature nodes
-            if not isinstance(output_node, FeatureNode):
-                continue
-            output_node: FeatureNode
-            output_dict[output_node.processor.feat_name] = output_node[sample]
+        # NOTE: outputs of nodes shared by several branches are memoized by these nodes'
+        #  caches, which release them once all branches have pulled them.
+        try:
+            for output_node in self.outputs:
+                # skipping nodes that aren't feature nodes
+                if not isinstance(output_node, FeatureNode):
+                    continue
+                output_node: FeatureNode
+                output_dict[output_node.processor.feat_name] = output_node[sample]
+        except Exception as err:
+            # if a branch failed, some shared outputs haven't been released: resetting
+            # the caches so they don't leak into the next call
+            for node in self.all_nodes:
+                if isinstance(node, SampleProcessorNode):
+                    node.cache.reset()
+            raise err
         return output_dict
 
     def _repr_svg_(self):
@@ -1,7 +1,6 @@
-import io
 import math
 from dataclasses import dataclass
-from itertools import product
+from itertools import chain
 from typing import TYPE_CHECKING, Literal, Union
 from typing import Tuple, List, Optional
 
@@ -33,7 +32,7 @@ def svg_coord(point: Point) -> Point:
     return point[0], abs(point[1])
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphNode:
     radius: float
     center: Point
@@ -52,7 +51,7 @@ class GraphNode:
         self.center = rotate(self.center, radians)
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     points: List[Point]
     head_angle: float
@@ -102,11 +101,12 @@ class SVGGraphRenderer:
         from grandalf.layouts import SugiyamaLayout
         from grandalf.routing import EdgeViewer, route_with_lines
 
-        vertices_dict = {node: Vertex(data=node) for node in nodes}
-        edges = []
-        for node in nodes:
-            for start_node, end_node in product([node], node.children):
-                edges.append(Edge(vertices_dict[start_node], vertices_dict[end_node]))
+        # vertices are keyed by node identity: hashing a node hashes its whole ancestry.
+        # This relies on the children of the rendered nodes all being rendered nodes,
+        # which `ExtractionDAG.add_pipeline` guarantees by detaching merged duplicates
+        vertices_dict = {id(node): Vertex(data=node) for node in nodes}
+        edges = [Edge(vertices_dict[id(node)], vertices_dict[id(child)])
+                 for node in nodes for child in node.children]
         graph = Graph(list(vertices_dict.values()), edges)
 
         class defaultview:
@@ -131,20 +131,21 @@ class SVGGraphRenderer:
                        for v in graph.C[0].sV]
         graph_edges = [GraphEdge(e.view._pts, e.view.head_angle, e.v[0].data, e.v[1].data)
                        for e in layout.g.E()]
-        for element in graph_nodes + graph_edges:
-            element.rotate(math.radians(90))
-        x_min = min([n.top_left()[0] for n in graph_nodes])
-        y_max = max([n.top_left()[1] for n in graph_nodes])
+        radians = math.radians(90)
+        for element in chain(graph_nodes, graph_edges):
+            element.rotate(radians)
+        xs, ys = zip(*[n.top_left() for n in graph_nodes])
+        x_min, y_max = min(xs), max(ys)
         offset = (-(x_min - self.GRAPH_PADDING), -(y_max + self.GRAPH_PADDING))
-        for element in graph_nodes + graph_edges:
+        for element in chain(graph_nodes, graph_edges):
             element.translate(offset)
         return graph_nodes, graph_edges
 
     def build_drawing(self, nodes: List[GraphNode], edges: List[GraphEdge]) -> 'Drawing':
         import drawsvg as draw
 
-        x_max = max([n.bottom_right()[0] for n in nodes])
-        y_min = min([n.bottom_right()[1] for n in nodes])
+        xs, ys = zip(*[n.bottom_right() for n in nodes])
+        x_max, y_min = max(xs), min(ys)
 
         d = draw.Drawing(x_max + self.GRAPH_PADDING, abs(y_min) + self.GRAPH_PADDING, origin=(0, 0))
         g = draw.Group(stroke='black', fill='none')
@@ -182,7 +183,7 @@ class SVGGraphRenderer:
         if isinstance(dag, ExtractionPipeline):
             all_nodes = dag.all_nodes
         elif isinstance(dag, ExtractionDAG):
-            all_nodes = list(dag.nodes | {dag.root_node})
+            all_nodes = [dag.root_node, *dag.nodes]
         else:
             raise TypeError("Unsupported object type for dag")
 
@@ -200,6 +201,10 @@ class SVGGraphRenderer:
         return self.render(dag).as_svg()
 
     def render_png(self, dag: Union['ExtractionPipeline', 'ExtractionDAG']) -> bytes:
-        bytes_io = io.BytesIO()
-        self.render(dag).save_png(fname=bytes_io)
-        return bytes_io.getvalue()
+        try:
+            import cairosvg
+        except ImportError:
+            raise ImportError(
+                "Missing packages for graph plotting. Please run `pip install adfluo[plots]`")
+        # rasterizing the SVG straight to bytes, without an intermediate file object
+        return cairosvg.svg2png(bytestring=self.render_svg(dag))
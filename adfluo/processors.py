@@ -1,11 +1,10 @@
+import logging
 from abc import abstractmethod, ABCMeta
 from dataclasses import dataclass
-from dis import get_instructions
 from inspect import signature
+from operator import itemgetter
 from typing import Any, Callable, TYPE_CHECKING, Hashable, Optional, Iterable, Type
 
-from sortedcontainers import SortedDict
-
 from . import DatasetLoader
 from .dataset import Sample
 from .exceptions import InvalidInputData
@@ -18,7 +17,7 @@ if TYPE_CHECKING:
     from .pipeline import PipelineElement
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParametersCount:
     nb_args: int
     variable: bool
@@ -27,19 +26,30 @@ class ParametersCount:
         return nb_args >= self.nb_args if self.variable else nb_args == self.nb_args
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProcessorParameter:
     default: Hashable
 
 
 # TODO : take in consideration hashing
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExtractorHyperParameter:
     name: str
     type: Optional[Type]
 
 
+# parameters declared without a default are all the same (frozen) object
+_NO_DEFAULT_PARAM = ProcessorParameter(None)
+
+
+# builtin types whose values are always hashable (unlike tuples or frozensets,
+# that can hold unhashable items), and thus don't need a hashing test
+_HASHABLE_SCALAR_TYPES = frozenset({str, int, float, bool, bytes, type(None)})
+
+
 def param(default: Optional[Hashable] = None) -> Any:
+    if default is None:
+        return _NO_DEFAULT_PARAM
     return ProcessorParameter(default)
 
 
@@ -47,19 +57,43 @@ def hparam(name: str, type: Optional[Type] = None) -> Any:
     return ExtractorHyperParameter(name, type)
 
 
+def return_annotation(fun: Callable) -> Any:
+    """Returns the return type annotation of a callable, or `Any` if it has none"""
+    try:
+        return fun.__annotations__["return"]
+    except (AttributeError, KeyError):
+        return Any
+
+
 class ProcessorBase(metaclass=ABCMeta):
     """Abstract base class for a processor from the feature extraction pipeline"""
+    _class_params: frozenset[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # parameters are collected once per class, along its MRO so that
+        # parameters declared by parent classes are inherited
+        class_attrs = {}
+        for klass in reversed(cls.__mro__):
+            class_attrs.update(vars(klass))
+        cls._class_params = frozenset(k for k, v in class_attrs.items()
+                                      if isinstance(v, ProcessorParameter))
 
     def __init__(self, **kwargs):
+        # the processor's hash and string representation are computed on their
+        # first use, and reset if its parameters are changed by `set_hparams`
+        self._hash: Optional[int] = None
+        self._str: Optional[str] = None
         param_names = set(self.class_params)
         # setting kwargs-defined parameter values
         for key, val in kwargs.items():
             if key not in param_names:
                 raise AttributeError(f"Attribute {key} isn't a processor parameter")
-            try:
-                hash(val)
-            except TypeError:
-                raise ValueError(f"Value for parameter {key} isn't hashable and has to be.")
+            if type(val) not in _HASHABLE_SCALAR_TYPES:
+                try:
+                    hash(val)
+                except TypeError:
+                    raise ValueError(f"Value for parameter {key} isn't hashable and has to be.")
 
             setattr(self, key, val)
             param_names.remove(key)
@@ -68,6 +102,7 @@ class ProcessorBase(metaclass=ABCMeta):
         self._hparams = {hparam.name: (hparam, attr_name)
                          for attr_name, hparam in self.__dict__.items()
                          if isinstance(hparam, ExtractorHyperParameter)}
+        self._hparams_names = frozenset(self._hparams)
 
         # remaining parameters are set to the default set in the class attribute
         for param_key in param_names:
@@ -75,8 +110,13 @@ class ProcessorBase(metaclass=ABCMeta):
             setattr(self, param_key, proc_param.default)
         self._current_sample: Optional[Sample] = None
 
-        if len(self.signature.parameters) < 1:
+        # the (costly) signature inspection is only done once per processor
+        sig_params = self.signature.parameters
+        if len(sig_params) < 1:
             raise ValueError("Function must have at least one parameter")
+        # 2 is "VAR_POSITIONAL"
+        variable_params = any(param.kind == 2 for param in sig_params.values())
+        self._parameters = ParametersCount(len(sig_params), variable_params)
 
         self.post_init()
 
@@ -94,10 +134,8 @@ class ProcessorBase(metaclass=ABCMeta):
         pass
 
     @property
-    def parameters(self):
-        # 2 is "VAR_POSITIONAL"
-        variable_params = any(param.kind == 2 for param in self.signature.parameters.values())
-        return ParametersCount(len(self.signature.parameters), variable_params)
+    def parameters(self) -> ParametersCount:
+        return self._parameters
 
     @property
     @abstractmethod
@@ -105,77 +143,69 @@ class ProcessorBase(metaclass=ABCMeta):
         pass
 
     @property
-    def class_params(self) -> set[str]:
-        # TODO: maybe use dir(self.__class__) to allow for inheritance
-        return {k for k, v in self.__class__.__dict__.items()
-                if isinstance(v, ProcessorParameter)}
+    def class_params(self) -> frozenset[str]:
+        return self._class_params
 
     @property
-    def hparams(self) -> set[str]:
-        return set(self._hparams.keys())
+    def hparams(self) -> frozenset[str]:
+        return self._hparams_names
 
     @property
     def unset_hparams(self) -> set[str]:
-        return {hparam.name for hparam in self.__dict__.values()
-                if isinstance(hparam, ExtractorHyperParameter)}
+        # only the attributes bound to hparams can still hold an unset hparam
+        return {hparam_name for hparam_name, (_, hparam_attr) in self._hparams.items()
+                if isinstance(getattr(self, hparam_attr), ExtractorHyperParameter)}
 
     @property
-    def _sorted_params(self) -> SortedDict:
-        param_dict = SortedDict()
-        for k in self.class_params:
-            param_dict[k] = getattr(self, k, None)
-        return param_dict
+    def _sorted_params(self) -> tuple[tuple[str, Any], ...]:
+        # parameter names are unique, so the (name, value) pairs are sorted by name
+        return tuple(sorted((k, getattr(self, k, None)) for k in self.class_params))
 
     def set_hparams(self, **hparams: dict[str, Any]):
         # setting only the hparams that are injected in this processors
-        for hparam_name in set(self._hparams.keys()) | self.hparams:
-            hparam, hparam_attr = self._hparams[hparam_name]
+        for hparam_name, (hparam, hparam_attr) in self._hparams.items():
             proc_param_value = hparams[hparam_name]
             # converting param value using hparam type if specified
             if hparam.type is not None:
                 proc_param_value = hparam.type(proc_param_value)
             setattr(self, hparam_attr, proc_param_value)
+        self._hash = None
+        self._str = None
 
     def __hash__(self):
-        return hash((self.__class__, tuple(self._sorted_params.items())))
+        if self._hash is None:
+            # the hash doesn't depend on the parameters' order: no need to sort them
+            self._hash = hash((self.__class__, frozenset((k, getattr(self, k, None))
+                                                         for k in self.class_params)))
+        return self._hash
 
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        # hashes are cached and already include the processor's class
+        return self is other or (type(self) is type(other) and hash(self) == hash(other))
 
     def __repr__(self):
         return f"<{str(self)}>"
 
     def __str__(self):
-        return "{class_name}({args})".format(
-            class_name=self.__class__.__name__,
-            args=",".join(f"{key}={value!r}" for key, value in self._sorted_params.items())
-        )
+        if self._str is None:
+            self._str = "{class_name}({args})".format(
+                class_name=self.__class__.__name__,
+                args=",".join(f"{key}={value!r}" for key, value in self._sorted_params)
+            )
+        return self._str
 
     def __rshift__(self, other: 'PipelineElement'):
-        from .pipeline import (ExtractionPipeline, PIPELINE_TYPE_ERROR,
-                               PipelineBuildError)
+        # the pipeline module imports this one, hence the import at call time
+        from .pipeline import ExtractionPipeline
         new_pipeline = ExtractionPipeline()
         new_pipeline.append(self)
-        if isinstance(other, ProcessorBase):
-            new_pipeline.append(other)
-        elif isinstance(other, ExtractionPipeline):
-            new_pipeline.concatenate(other)
-        else:
-            raise PipelineBuildError(PIPELINE_TYPE_ERROR.format(obj_type=type(other)))
-        return new_pipeline
+        return new_pipeline >> other
 
     def __or__(self, other: 'PipelineElement'):
-        from .pipeline import (ExtractionPipeline, PIPELINE_TYPE_ERROR,
-                               PipelineBuildError)
+        from .pipeline import ExtractionPipeline
         new_pipeline = ExtractionPipeline()
         new_pipeline.append(self)
-        if isinstance(other, ProcessorBase):
-            new_pipeline.add_parallel_proc(other)
-        elif isinstance(other, ExtractionPipeline):
-            new_pipeline.add_parallel_pipeline(other)
-        else:
-            raise PipelineBuildError(PIPELINE_TYPE_ERROR.format(obj_type=type(other)))
-        return new_pipeline
+        return new_pipeline | other
 
 
 class SampleProcessor(ProcessorBase, metaclass=ABCMeta):
@@ -192,10 +222,7 @@ class SampleProcessor(ProcessorBase, metaclass=ABCMeta):
 
     @property
     def output_type(self):
-        try:
-            return self.process.__annotations__["return"]
-        except KeyError:
-            return Any
+        return return_annotation(self.process)
 
     def __call__(self, sample: Sample, sample_data: tuple[Any]) -> Any:
         self._current_sample = sample
@@ -214,17 +241,18 @@ class FunctionWrapperMixin:
         return signature(self.fun)
 
     def __hash__(self):
-        """Hashes the disassembled code of the wrapped function."""
-        instructions = tuple((instr.opname, instr.arg, instr.argval)
-                             for instr in get_instructions(self.fun))
-        return hash((self.__class__, self.fun.__name__, instructions))
+        """Hashes the bytecode of the wrapped function, along with the constants
+        and names (including closure variables) it refers to."""
+        if self._hash is None:
+            code = self.fun.__code__
+            self._hash = hash((self.__class__, self.fun.__name__, code.co_code,
+                               code.co_consts, code.co_names, code.co_varnames,
+                               code.co_freevars, code.co_cellvars))
+        return self._hash
 
     @property
     def output_type(self):
-        try:
-            return self.fun.__annotations__["return"]
-        except KeyError:
-            return Any
+        return return_annotation(self.fun)
 
 
 class FunctionWrapperProcessor(FunctionWrapperMixin, SampleProcessor):
@@ -266,13 +294,13 @@ class ListWrapperProcessor(SampleProcessor):
 
     @property
     def output_type(self):
-        try:
-            return list[self.process.proc["return"]]
-        except KeyError:
-            return Any
+        return list[self.proc.output_type]
 
     def process(self, arg: Iterable[Any]) -> list[Any]:
-        return [self.proc(self._current_sample, (sub_sample,)) for sub_sample in arg]
+        # all sub-samples come from the same sample: setting it once, then
+        # calling the wrapped processor's `process` directly
+        self.proc._current_sample = self._current_sample
+        return list(map(self.proc.process, arg))
 
 
 L = ListWrapperProcessor
@@ -288,11 +316,17 @@ class SampleInputProcessor(SampleProcessor):
         self.validator_fn: Optional[ValidatorFunction] = None
 
     def process(self, *args) -> Any:
-        data = self.current_sample[self.data_name]
+        return self(self.current_sample, args)
+
+    def __call__(self, sample: Sample, sample_data: tuple[Any]) -> Any:
+        # inputs ignore their parent's output: the sample is read directly,
+        # without going through `process`
+        self._current_sample = sample
+        data = sample[self.data_name]
 
-        if self.validator_fn is not None:
-            if not self.validator_fn(data):
-                raise InvalidInputData(self.data_name, self.current_sample.id)
+        validator_fn = self.validator_fn
+        if validator_fn is not None and not validator_fn(data):
+            raise InvalidInputData(self.data_name, sample.id)
         return data
 
     def __str__(self):
@@ -315,9 +349,9 @@ class DatasetInputProcessor(SampleProcessor):
     def process(self, *args) -> Any:
         data = self.dataset[self.data_name]
 
-        if self.validator_fn is not None:
-            if not self.validator_fn(data):
-                raise InvalidInputData(self.data_name, self.current_sample.id)
+        validator_fn = self.validator_fn
+        if validator_fn is not None and not validator_fn(data):
+            raise InvalidInputData(self.data_name, self.current_sample.id)
         return data
 
     def __str__(self):
@@ -336,6 +370,9 @@ class LoggerProcessor(SampleProcessor):
         self.formatter = formatter
 
     def process(self, *args) -> tuple:
+        # formatting the message only if it's going to be logged
+        if not logger.isEnabledFor(logging.INFO):
+            return args
         msg = str(self.formatter(*args)) if self.formatter is not None else str(args)
         if self.name is not None:
             msg = f"{self.name}: {msg}"
@@ -361,6 +398,13 @@ class BaseFeat(SampleProcessor, metaclass=ABCMeta):
     def process(self, *args) -> tuple:
         return args[0]
 
+    def __call__(self, sample: Sample, sample_data: tuple[Any]) -> Any:
+        # features are passthroughs: no need to unpack the data for `process`,
+        # unless a subclass overrides it
+        if type(self).process is BaseFeat.process:
+            return sample_data[0]
+        return super().__call__(sample, sample_data)
+
 
 class SampleFeatureProcessor(BaseFeat):
     """A passthrough processor used to indicate per-sample features (Feats)"""
@@ -395,10 +439,7 @@ class DatasetAggregator(ProcessorBase, metaclass=ABCMeta):
 
     @property
     def output_type(self):
-        try:
-            return self.aggregate.__annotations__["return"]
-        except KeyError:
-            return Any
+        return return_annotation(self.aggregate)
 
     @abstractmethod
     def aggregate(self, samples_data: list[Any] | list[tuple[Any, ...]]) -> Any:
@@ -406,11 +447,12 @@ class DatasetAggregator(ProcessorBase, metaclass=ABCMeta):
 
     def __call__(self, samples_data: dict[SampleID, tuple[Any, ...]]):
         # Call aggregate
-        first_value = next(iter(samples_data.values()))
+        values = samples_data.values()
+        first_value = next(iter(values))
         if len(first_value) == 1:
-            return self.aggregate([t[0] for t in samples_data.values()])
+            return self.aggregate(list(map(itemgetter(0), values)))
         else:
-            return self.aggregate(list(samples_data.values()))
+            return self.aggregate(list(values))
 
 
 class FunctionWrapperAggregator(FunctionWrapperMixin, DatasetAggregator):
@@ -131,10 +131,7 @@ class CSVStorage(BaseFileBasedStorage):
             fields = [index_column] + sorted(list(self._data.keys()))
         writer = csv.DictWriter(self.file, fieldnames=fields, dialect=self.dialect)
         writer.writeheader()
-        for key, data in data.items():
-            row_dict = {index_column: key}
-            row_dict.update(**data)
-            writer.writerow(row_dict)
+        writer.writerows({index_column: key, **row_data} for key, row_data in data.items())
 
     def load(self, path: Path) -> dict:
         with path.open() as f:
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 logger = logging.getLogger("adfluo")
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionPolicy:
     skip_errors: bool = False
     no_cache: bool = False
@@ -5,6 +5,7 @@ from typing import List, Any
 import pytest
 
 from adfluo import Extractor, Input, F, Agg, Feat
+from adfluo.cache import SingleValueCache
 from adfluo.dataset import ListLoader
 from adfluo.processors import DatasetAggregator, DSFeat, Pass, DSInput
 
@@ -80,3 +81,24 @@ def test_wrong_feat_after_agg():
             >> Agg(lambda x: sum(x))
             >> F(lambda x: x + 1)
             >> Feat("sum"))
+
+
+def test_parallel_aggregations_caches():
+    def count_times_two(n: int) -> int:
+        return n * 2
+
+    pl = ((Input("data_a")
+           >> (Agg(lambda x: max(x)) | Pass)
+           >> F(lambda m, x: x / m)
+           >> Feat("normed"))
+          |
+          (Input("data_b")
+           >> Agg(lambda x: len(x))
+           >> F(count_times_two)
+           >> DSFeat("count")))
+    pl.check()
+    for node in pl.all_nodes:
+        if str(node) == "F(count_times_two)":
+            assert isinstance(node.cache, SingleValueCache)
+        elif str(node) == "F(<lambda>)":
+            assert not isinstance(node.cache, SingleValueCache)
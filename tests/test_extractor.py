@@ -2,11 +2,11 @@ from typing import Any
 
 import pytest
 
-from adfluo import SampleProcessor, param, Input, Feat, F, Sample
+from adfluo import SampleProcessor, param, Input, Feat, F, Sample, Agg
 from adfluo.exceptions import DuplicateSampleError
 from adfluo.extraction_graph import SampleProcessorNode
 from adfluo.extractor import Extractor
-from adfluo.processors import hparam
+from adfluo.processors import hparam, DSFeat
 
 dataset = [{
     "data_a": i,
@@ -138,3 +138,39 @@ def test_hparams():
     for proc_node in input_node.children:
         proc_node: SampleProcessorNode
         assert len(proc_node.processor.unset_hparams) == 0
+
+
+def test_unset_hparams_extraction():
+    extractor = Extractor(show_progress=False)
+    extractor.add_extraction(Input("data_a") >> TimesX(factor=hparam("factor")) >> Feat("times_x"))
+    with pytest.raises(RuntimeError):
+        extractor.extract_to_dict(dataset)
+
+    extractor.set_hparams({"factor": 4})
+    d = extractor.extract_to_dict(dataset, storage_indexing="feature")
+    assert d == {"times_x": {str(i): i * 4 for i in range(50)}}
+
+
+def test_unset_hparams_pruned_features():
+    extractor = Extractor(show_progress=False)
+    extractor.add_extraction(Input("data_a") >> TimesX(factor=hparam("factor")) >> Feat("times_x"))
+    extractor.add_extraction(Input("data_a") >> F(lambda x: x + 1) >> Feat("plus"))
+    # the pruned feature was the only one with an unset hyperparameter
+    extractor.extraction_DAG.prune_features(keep_only=["plus"])
+    d = extractor.extract_to_dict(dataset, storage_indexing="feature")
+    assert d == {"plus": {str(i): i + 1 for i in range(50)}}
+
+
+def test_unset_hparams_aggregation():
+    extractor = Extractor(show_progress=False)
+    extractor.add_extraction(Input("data_a")
+                             >> TimesX(factor=hparam("factor"))
+                             >> Agg(lambda x: sum(x))
+                             >> DSFeat("sum"))
+    with pytest.raises(RuntimeError):
+        extractor.extract_aggregations(dataset)
+
+    # once set, hyperparameters don't prevent the aggregation
+    extractor.set_hparams({"factor": 2})
+    out = extractor.extract_aggregations(dataset)
+    assert out == {"sum": sum(range(50)) * 2}
@@ -260,6 +260,154 @@ def test_rombus_DAG():
     )
 
 
+def test_uneven_rombus_DAG():
+    def a(arg): pass
+
+    def b(arg): pass
+
+    def c(arg): pass
+
+    dag = ExtractionDAG()
+    dag.add_pipeline(
+        Input("input_a")
+        >> (F(a) | (F(b) >> F(c)))
+        >> F(lambda x, y: x + y)
+        >> Feat("feat_a")
+    )
+    input_node = dag.root_node.children[0]
+    assert len(input_node.children) == 2
+    assert len(dag.nodes) == 6
+
+
+def test_duplicate_sibling_inputs():
+    dag = ExtractionDAG()
+    dag.add_pipeline(
+        (Input("input_a") | Input("input_a"))
+        >> F(lambda x, y: x + y)
+        >> Feat("feat_a")
+    )
+    assert len(dag.root_node.children) == 1
+    input_node = dag.root_node.children[0]
+    assert len(input_node.children) == 2
+    sum_node = dag.feature_nodes["feat_a"].parents[0]
+    assert sum_node.parents[0] is sum_node.parents[1] is input_node
+    assert len(dag.nodes) == 3
+
+
+def assert_closed_dag(dag: ExtractionDAG):
+    # every node linked to a DAG node has to be a node from the DAG
+    dag_nodes = {id(node) for node in dag.nodes} | {id(dag.root_node)}
+    for node in [dag.root_node, *dag.nodes]:
+        for child in node.children:
+            assert id(child) in dag_nodes, f"{child} (child of {node}) isn't in the DAG"
+
+
+def assert_empty_caches(dag: ExtractionDAG):
+    for node in dag.nodes:
+        if isinstance(node, SampleProcessorNode):
+            assert not node.cache._samples_cache, f"{node} still has cached samples"
+
+
+def test_redundant_rombus_branches():
+    def a(arg):
+        return arg + 1
+
+    def b(arg):
+        return arg * 2
+
+    dag = ExtractionDAG()
+    dag.add_pipeline(
+        Input("input_a")
+        >> ((F(a) >> F(b)) | (F(a) >> F(b)))
+        >> F(lambda x, y: x + y)
+        >> Feat("feat_a")
+    )
+    assert len(dag.nodes) == 5
+    input_node = dag.root_node.children[0]
+    assert len(input_node.children) == 1
+    b_node = input_node.children[0].children[0]
+    assert len(b_node.children) == 2
+    assert_closed_dag(dag)
+
+    dag.set_loader(ListLoader([{"input_a": i} for i in range(5)]))
+    out = dag.extract_feature_wise("feat_a", lambda it: it)
+    assert out == {str(i): (i + 1) * 4 for i in range(5)}
+    assert_empty_caches(dag)
+
+
+def test_duplicate_parent_branches():
+    def f(arg):
+        return arg + 1
+
+    def g(arg):
+        return arg * 2
+
+    dag = ExtractionDAG()
+    dag.add_pipeline(Input("input_a") >> ((F(f) >> Feat("feat_x")) | (F(f) >> F(g) >> Feat("feat_y"))))
+    assert_closed_dag(dag)
+    input_node = dag.root_node.children[0]
+    assert len(input_node.children) == 1
+
+    dag.set_loader(ListLoader([{"input_a": i} for i in range(5)]))
+    assert dag.extract_feature_wise("feat_x", lambda it: it) == {str(i): i + 1 for i in range(5)}
+    assert dag.extract_feature_wise("feat_y", lambda it: it) == {str(i): (i + 1) * 2 for i in range(5)}
+    assert_empty_caches(dag)
+
+
+def test_duplicate_parent_branches_distinct_inputs():
+    def f(arg):
+        return arg + 1
+
+    def g(arg):
+        return arg * 2
+
+    # the duplicate F(f) is found as a parent, and its own (duplicate) input
+    # node is left without children: both have to be dropped
+    dag = ExtractionDAG()
+    dag.add_pipeline((Input("input_a") >> F(f) >> Feat("feat_x"))
+                     | (Input("input_a") >> F(f) >> F(g) >> Feat("feat_y")))
+    assert_closed_dag(dag)
+    assert len(dag.root_node.children) == 1
+    input_node = dag.root_node.children[0]
+    assert len(input_node.children) == 1
+
+    dag.set_loader(ListLoader([{"input_a": i} for i in range(5)]))
+    assert dag.extract_feature_wise("feat_x", lambda it: it) == {str(i): i + 1 for i in range(5)}
+    assert dag.extract_feature_wise("feat_y", lambda it: it) == {str(i): (i + 1) * 2 for i in range(5)}
+    assert_empty_caches(dag)
+
+
+def test_distinct_closures_branches():
+    a, b = 1, 100
+    # same bytecode, different free variables: these shouldn't be merged
+    dag = ExtractionDAG()
+    dag.add_pipeline(Input("input_a") >> F(lambda x: x + a) >> Feat("feat_a"))
+    dag.add_pipeline(Input("input_a") >> F(lambda x: x + b) >> Feat("feat_b"))
+    assert_closed_dag(dag)
+    input_node = dag.root_node.children[0]
+    assert len(input_node.children) == 2
+
+    dag.set_loader(ListLoader([{"input_a": i} for i in range(5)]))
+    assert dag.extract_feature_wise("feat_a", lambda it: it) == {str(i): i + 1 for i in range(5)}
+    assert dag.extract_feature_wise("feat_b", lambda it: it) == {str(i): i + 100 for i in range(5)}
+    assert_empty_caches(dag)
+
+
+def test_shared_inputs_children():
+    def a(arg_a, arg_b): pass
+
+    def b(arg_a, arg_b): pass
+
+    def c(arg): pass
+
+    dag = ExtractionDAG()
+    dag.add_pipeline((Input("input_a") | Input("input_b"))
+                     >> ((F(a) >> Feat("feat_a")) | (F(b) >> Feat("feat_b"))))
+    dag.add_pipeline(Input("input_a") >> F(c) >> Feat("feat_c"))
+    children_counts = {node.data_name: len(node.children) for node in dag.root_node.children}
+    assert children_counts == {"input_a": 3, "input_b": 2}
+
+
 def test_duplicate_feature():
     dag = ExtractionDAG()
     with pytest.raises(AssertionError, match="Duplicate name for feature name 'feat_a'"):
@@ -1,9 +1,15 @@
+import gc
+import weakref
 from typing import Any
 
 import pytest
 
 from adfluo import ExtractionPipeline
+from adfluo.exceptions import ExtractionError
+from adfluo.extraction_graph import BaseGraphNode, SampleProcessorNode
+from adfluo.pipeline import wrap_processor
 from adfluo.processors import SampleProcessor, F, Input, Feat
+from adfluo.utils import ExtractionPolicy
 
 
 def test_processor_chain():
@@ -227,3 +233,66 @@ def test_merge_than_multiple_features():
     )
     sample = {"a": 1, "b": 0}
     assert pl(sample) == {"feat_sum": 1, "feat_prod": 0}
+
+
+def test_pipeline_nodes_topological_order():
+    def add_one(n: int) -> int:
+        return n + 1
+
+    pl = ((Input("a") | (Input("b") >> F(add_one)))
+          >> F(lambda a, b: a + b)
+          >> ((F(add_one) >> Feat("feat_a")) | Feat("feat_b")))
+    seen_nodes = set()
+    for node in pl.all_nodes:
+        assert all(id(parent) in seen_nodes for parent in node.parents)
+        seen_nodes.add(id(node))
+    assert len(seen_nodes) == 7
+
+
+def test_pipeline_checked_once():
+    def add_one(n: int) -> int:
+        return n + 1
+
+    pl = Input("n") >> F(add_one)
+    assert not pl._checked
+    pl = pl >> Feat("plus_one")
+    assert pl({"n": 0}) == {"plus_one": 1}
+    assert pl._checked
+    assert pl({"n": 1}) == {"plus_one": 2}
+
+    pl = pl | Input("m")
+    assert not pl._checked
+
+
+def test_pipeline_call_after_error(monkeypatch):
+    # errors aren't skipped, whatever the policy that's been set by another extraction
+    monkeypatch.setattr(BaseGraphNode, "extraction_policy", ExtractionPolicy())
+
+    def add_one(n: int) -> int:
+        return n + 1
+
+    def check_small(n: int) -> int:
+        if n > 10:
+            raise ValueError("Value is too big")
+        return n
+
+    pl = (Input("n")
+          >> F(add_one)
+          >> ((F(check_small) >> Feat("checked")) | (F(add_one) >> Feat("plus_two"))))
+    assert pl({"n": 1}) == {"checked": 2, "plus_two": 3}
+    with pytest.raises(ExtractionError):
+        pl({"n": 20})
+    assert pl({"n": 2}) == {"checked": 3, "plus_two": 4}
+
+
+def test_wrapped_processor_class_collected():
+    # processor classes created on the fly aren't kept alive by the node types cache
+    class AddOne(SampleProcessor):
+        def process(self, n: int) -> int:
+            return n + 1
+
+    assert isinstance(wrap_processor(AddOne()), SampleProcessorNode)
+    class_ref = weakref.ref(AddOne)
+    del AddOne
+    gc.collect()
+    assert class_ref() is None
@@ -71,3 +71,19 @@ def test_plot_wide_dag():
                          >> Feat(f"feat_{feat_id}"))
 
     plot_svg = SVGGraphRenderer().render_svg(dag)
+
+
+def test_plot_dag_merged_duplicates():
+    def f(n: int) -> int:
+        return n + 1
+
+    def g(n: int) -> int:
+        return n * 2
+
+    # the second F(f) is merged into the first one when the pipeline is added
+    dag = ExtractionDAG()
+    dag.add_pipeline(Input("a") >> ((F(f) >> Feat("x")) | (F(f) >> F(g) >> Feat("y"))))
+    dag.add_pipeline((Input("b") >> F(f) >> Feat("z"))
+                     | (Input("b") >> F(f) >> F(g) >> Feat("w")))
+
+    plot_svg = SVGGraphRenderer().render_svg(dag)
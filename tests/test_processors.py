@@ -1,7 +1,6 @@
 from typing import Any, Tuple
 
 import pytest
-from sortedcontainers import SortedDict
 
 from adfluo.dataset import DictSample
 from adfluo.processors import param, SampleProcessor, F, Input, Feat, ListWrapperProcessor, hparam
@@ -15,7 +14,7 @@ def test_proc_params():
         def process(self, *args) -> Any:
             pass
 
-    assert TestProc(a=1, b="b")._sorted_params == SortedDict({'a': 1, 'b': 'b'})
+    assert TestProc(a=1, b="b")._sorted_params == (('a', 1), ('b', 'b'))
     assert TestProc(a=1, b=2) == TestProc(a=1, b=2)
     assert TestProc(a=1, b="a") != TestProc(a=1, b="b")
     assert repr(TestProc(a=1, b=2)) == "<TestProc(a=1,b=2)>"
@@ -32,9 +31,23 @@ def test_processor_default_params():
         def process(self, *args) -> Any:
             pass
 
-    assert TestProc()._sorted_params == SortedDict({'a': 1, 'b': 'c'})
+    assert TestProc()._sorted_params == (('a', 1), ('b', 'c'))
     assert repr(TestProc()) == "<TestProc(a=1,b='c')>"
-    assert TestProc(a=2)._sorted_params == SortedDict({'a': 2, 'b': 'c'})
+    assert TestProc(a=2)._sorted_params == (('a', 2), ('b', 'c'))
+
+
+def test_inherited_params():
+    class ParentProc(SampleProcessor):
+        a = param(1)
+
+        def process(self, *args) -> Any:
+            pass
+
+    class ChildProc(ParentProc):
+        b = param("c")
+
+    assert ChildProc(a=2)._sorted_params == (('a', 2), ('b', 'c'))
+    assert ParentProc()._sorted_params == (('a', 1),)
 
 
 def test_fun_hash():
@@ -57,6 +70,14 @@ def test_lambda():
     assert F(lambda x, y: list([x, y])) != F(lambda x, y: tuple([x, y]))
 
 
+def test_closure_hash():
+    a, b = 1, 100
+    # both closures have the same bytecode, but read different free variables
+    plus_a, plus_b = F(lambda x: x + a), F(lambda x: x + b)
+    assert hash(plus_a) != hash(plus_b)
+    assert plus_a != plus_b
+
+
 def test_nb_args():
     def f(a, b):
         return a * b
@@ -121,6 +142,15 @@ def test_feat_proc():
     assert feat_proc(None, ("test",)) == "test"
 
 
+def test_feat_proc_override():
+    class UpperFeat(Feat):
+        def process(self, arg: str) -> str:
+            return arg.upper()
+
+    feat_proc = UpperFeat(feat_name="test_feat")
+    assert feat_proc(None, ("test",)) == "TEST"
+
+
 def test_proc_args():
     class PassProc(SampleProcessor):
         def process(self, *args) -> Any:
@@ -148,6 +178,7 @@ def test_list_processors():
     assert ListWrapperProcessor(F(f))(None, ([1, 2, 3],)) == [1, 4, 9]
     assert ListWrapperProcessor(SquareProc())(None, ([1, 2, 3],)) == [1, 4, 9]
     assert ListWrapperProcessor(F(f)) == ListWrapperProcessor(F(f))
+    assert ListWrapperProcessor(F(f)).output_type == list[int]
 
 
 def test_processor_hparam_hash():
@@ -191,9 +222,12 @@ def test_processor_hparam_set():
             return 1
 
     proc_a = ProcA(param_a="test", param_b=hparam("hparam_b"))
+    hash(proc_a)
     proc_a.set_hparams(hparam_a=10, hparam_b=34)
     assert proc_a.param_a == "test"
     assert proc_a.param_b == 34
+    # the hash has to be updated once the hparams are set
+    assert proc_a == ProcA(param_a="test", param_b=34)
 
 
 def test_processors_hashcheck():